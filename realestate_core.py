@@ -0,0 +1,257 @@
+import hashlib
+import os
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow as pa
+
+# --- 데이터 로딩 및 전처리 ---
+# 엑셀 파싱 결과를 저장해 두는 디스크 캐시 폴더
+CACHE_DIR = ".cache"
+# 저장되는 데이터 형식(컬럼, dtype)이 바뀌면 숫자를 올려 이전 캐시를 무효화합니다.
+CACHE_VERSION = 3
+
+def build_region_groups(df):
+    """지역별 (날짜, 매매지수, 전세지수) 배열 묶음을 만드는 함수
+
+    각 배열은 날짜순으로 정렬된 연속 배열이라, 지역 필터는 딕셔너리 조회로,
+    날짜 범위 필터는 지역별 이진 탐색으로 처리할 수 있습니다.
+    모든 세션이 공유하는 배열이므로 읽기 전용으로 표시해 실수로 수정되지 않게 합니다.
+    """
+    region_groups = {}
+    for region, group in df.groupby('지역', observed=True, sort=False):
+        arrays = (group['날짜'].to_numpy(), group['매매지수'].to_numpy(), group['전세지수'].to_numpy())
+        for arr in arrays:
+            arr.flags.writeable = False
+        region_groups[region] = arrays
+    return region_groups
+
+def clean_index_sheet(sheet):
+    """지수 시트의 '구분'(날짜) 열을 인덱스로 옮기고 지수 값을 float32로 정리하는 함수
+
+    날짜로 읽을 수 없는 행(빈 칸, 각주 등)은 버리고, 숫자로 읽을 수 없는 칸('-' 등)과
+    빈 칸은 0으로 채웁니다.
+    """
+    # 날짜 변환은 long 형태로 펼치기 전에 해 두면 (날짜 수 × 지역 수)가 아닌 날짜 수만큼만 변환합니다.
+    dates = pd.to_datetime(sheet['구분'], errors='coerce', cache=True)
+    values = sheet.drop(columns='구분')
+    values.index = pd.DatetimeIndex(dates, name='날짜')
+    values = values[values.index.notna()]
+    # 나머지는 모두 지수 값이므로 숫자 변환, float32 변환, 빈 칸 0 채우기를 표 전체에 적용합니다.
+    return values.apply(pd.to_numeric, errors='coerce').astype('float32').fillna(0)
+
+def build_long_frame(sale, rent):
+    """정리된 매매/전세 시트(날짜 × 지역)를 (날짜, 지역, 매매지수, 전세지수) long 형태로 만드는 함수
+
+    두 시트에 모두 있는 날짜와 지역만 남깁니다. (한쪽에만 있는 날짜·지역은 버립니다.)
+    """
+    # 매매/전세 시트는 날짜와 지역 구성이 같으므로 melt + merge 대신
+    # 두 표를 같은 축으로 맞춘 뒤 numpy 배열을 그대로 펼쳐 long 형태로 만듭니다.
+    # 두 표의 축이 이미 같다면(일반적인 경우) 재정렬 없이 배열을 그대로 사용하고,
+    # 다르다면 두 표의 공통 날짜·지역으로 좁힙니다.
+    sale = sale.sort_index()
+    rent = rent.sort_index()
+    if not (rent.index.equals(sale.index) and rent.columns.equals(sale.columns)):
+        sale, rent = sale.align(rent, join='inner')
+
+    # 지역 → 날짜 순(열 우선, order='F')으로 펼쳐 두면 각 지역의 행이 날짜순으로
+    # 연속해서 놓이므로, 로딩 후 정렬이나 필터 후 재정렬이 필요 없습니다.
+    # 지역명은 엑셀 열 순서를 그대로 유지하는 category로 저장해 메모리를 줄입니다.
+    n_dates, n_regions = sale.shape
+    return pd.DataFrame({
+        '날짜': np.tile(sale.index.values, n_regions),
+        '지역': pd.Categorical.from_codes(np.repeat(np.arange(n_regions), n_dates), categories=sale.columns),
+        '매매지수': sale.to_numpy().ravel(order='F'),
+        '전세지수': rent.to_numpy().ravel(order='F'),
+    })
+
+def get_cache_path(file_path):
+    """엑셀 파일의 내용으로 캐시 파일 경로를 만드는 함수
+
+    수정 시각 대신 파일 내용의 해시를 키로 쓰므로, 배포나 git checkout으로 수정 시각만
+    바뀐 경우에도 캐시를 재사용하고, 여러 서버 프로세스가 같은 캐시 파일을 공유합니다.
+    """
+    digest = hashlib.sha1(f"{CACHE_VERSION}|".encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return os.path.join(CACHE_DIR, f"{digest.hexdigest()}.feather")
+
+# @st.cache_resource: 로딩한 데이터를 복사하지 않고 모든 세션이 하나의 객체로 공유합니다.
+# (st.cache_data는 호출할 때마다 결과를 복사하므로 읽기 전용 데이터에는 불필요한 비용입니다.)
+# 프로세스가 새로 뜰 때는 디스크의 Feather(Arrow IPC) 캐시를 읽어 엑셀 파싱을 건너뜁니다.
+@st.cache_resource
+def load_data(file_path):
+    """엑셀 파일을 로드하고 데이터를 전처리하는 함수
+
+    (long 형태 DataFrame, 지역별 배열 묶음)을 반환합니다.
+    반환값은 모든 세션이 공유하므로 수정하지 말고 읽기 용도로만 사용합니다.
+    """
+    try:
+        cache_path = get_cache_path(file_path)
+    except FileNotFoundError:
+        st.error(f"'{file_path}' 파일을 찾을 수 없습니다. app.py와 같은 폴더에 엑셀 파일을 넣어주세요.")
+        st.stop()
+
+    # 같은 엑셀 파일을 이미 변환해 두었다면 Feather 캐시를 바로 읽습니다.
+    # (Arrow IPC 형식이라 디코딩 비용이 거의 없고 category, float32 dtype도 그대로 복원됩니다.)
+    # 캐시 파일이 깨졌거나 읽을 수 없으면 엑셀을 다시 읽고 캐시를 새로 저장합니다.
+    if os.path.exists(cache_path):
+        try:
+            df = pd.read_feather(cache_path)
+            return df, build_region_groups(df)
+        except (OSError, pa.ArrowInvalid, ValueError):
+            pass
+
+    try:
+        # '3.매매지수', '4.전세지수' 시트를 읽습니다.
+        # calamine(Rust 기반) 엔진으로 통합 문서를 한 번만 열어 압축 해제와 공유 문자열 표를
+        # 두 시트가 함께 사용하고, 머리글이 없는 빈 열('Unnamed: n')은 건너뜁니다.
+        read_options = dict(
+            skiprows=[0, 2, 3],
+            usecols=lambda col: not str(col).startswith("Unnamed"),
+        )
+        with pd.ExcelFile(file_path, engine="calamine") as workbook:
+            sale = pd.read_excel(workbook, sheet_name="3.매매지수", **read_options)
+            rent = pd.read_excel(workbook, sheet_name="4.전세지수", **read_options)
+    except FileNotFoundError:
+        st.error(f"'{file_path}' 파일을 찾을 수 없습니다. app.py와 같은 폴더에 엑셀 파일을 넣어주세요.")
+        st.stop()
+    except Exception as e:
+        st.error(f"엑셀 파일을 읽는 중 오류가 발생했습니다. 시트 이름('3.매매지수', '4.전세지수')을 확인해주세요. 오류: {e}")
+        st.stop()
+
+    sale = clean_index_sheet(sale)
+    rent = clean_index_sheet(rent)
+
+    df = build_long_frame(sale, rent)
+
+    # 다음 실행을 위해 Feather 캐시를 저장합니다. (저장에 실패해도 앱은 계속 동작)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_feather(tmp_path, compression="lz4")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return df, build_region_groups(df)
+
+# @st.cache_data: 전체 기간(최소·최대 날짜)은 파일마다 한 번만 계산하고,
+# 이후 다시 실행될 때는 날짜 열 전체를 훑지 않고 저장된 값을 사용합니다.
+@st.cache_data
+def get_date_range(file_path):
+    """데이터 전체의 (최소 날짜, 최대 날짜)를 datetime.date로 구하는 함수
+
+    st.date_input이 바로 사용할 수 있도록 날짜(date) 형식으로 변환해 저장합니다.
+    """
+    df, _ = load_data(file_path)
+    return df['날짜'].min().date(), df['날짜'].max().date()
+
+# --- 그래프용 데이터 축소 ---
+# 그래프 전체에 그릴 점 개수 예산 (이보다 적으면 모든 점을 그대로 그립니다)
+MAX_TOTAL_POINTS = 5000
+# 지역별 경로의 모양이 유지되도록 남기는 최소 점 개수 (예산보다 우선합니다)
+MIN_POINTS_PER_REGION = 500
+
+def get_max_points_per_region(path_lengths):
+    """지역별 경로 길이 목록으로 지역마다 남길 최대 점 개수를 정하는 함수
+
+    전체 점 개수가 MAX_TOTAL_POINTS 이하이면 모든 점을 그대로 두고, 넘으면 예산을
+    지역 수로 나누되 MIN_POINTS_PER_REGION 아래로는 줄이지 않습니다.
+    지역이 많아 최소값이 적용되면 전체 점 개수는 예산을 넘을 수 있습니다.
+    """
+    if sum(path_lengths) <= MAX_TOTAL_POINTS:
+        return max(path_lengths)
+    return max(MAX_TOTAL_POINTS // len(path_lengths), MIN_POINTS_PER_REGION)
+
+def downsample_indices(n_points, max_points):
+    """점 n_points개 중 그래프에 남길 위치를 최대 max_points개 고르는 함수
+
+    x축이 시간이 아닌 매매지수인 경로 그래프라 LTTB처럼 x가 단조 증가해야 하는
+    방식 대신 날짜 순서상 고른 간격으로 정확히 max_points개를 고르며,
+    처음과 마지막 점은 항상 남깁니다.
+    """
+    if n_points <= max_points:
+        return np.arange(n_points)
+    return np.unique(np.linspace(0, n_points - 1, max_points).round().astype(int))
+
+# --- 데이터 필터링 ---
+def filter_regions(region_groups, start_date, end_date, selected_regions):
+    """선택한 기간과 지역에 해당하는 (지역, 날짜, 매매지수, 전세지수) 배열 목록을 만드는 함수"""
+    # 비교는 pandas Timestamp 대신 numpy datetime64 값과 배열로 직접 수행합니다.
+    start = np.datetime64(start_date, 'ns')
+    end = np.datetime64(end_date, 'ns')
+
+    selected = []
+    for region in selected_regions:
+        # 지역별 배열은 날짜순이므로 날짜 범위는 이진 탐색으로 잘라냅니다.
+        dates, sale_values, rent_values = region_groups[region]
+        lo = np.searchsorted(dates, start, side='left')
+        hi = np.searchsorted(dates, end, side='right')
+        if lo < hi:
+            selected.append((region, dates[lo:hi], sale_values[lo:hi], rent_values[lo:hi]))
+    return selected
+
+# --- 그래프 생성 ---
+# @st.cache_data: 같은 필터 조합(기간, 지역, 색상)으로 다시 실행되면 만들어 둔 그래프를 재사용합니다.
+# 인자는 모두 해시 가능한 값(문자열, 날짜, 튜플)으로 받습니다.
+@st.cache_data(max_entries=64)
+def build_figure(file_path, start_date, end_date, selected_regions, color_items):
+    """필터 조건에 맞는 데이터로 4분면 경로 그래프를 만드는 함수 (데이터가 없으면 None)"""
+    _, region_groups = load_data(file_path)
+    color_map = dict(color_items)
+
+    paths = filter_regions(region_groups, start_date, end_date, selected_regions)
+    if not paths:
+        return None
+    # 선택한 기간과 지역 수가 많아 점이 예산을 넘을 때만 지역별 점 개수를 줄입니다.
+    max_points = get_max_points_per_region([len(dates) for _, dates, _, _ in paths])
+
+    traces = []
+    label_x, label_y, label_text = [], [], []
+    for region, dates, sale_values, rent_values in paths:
+        keep = downsample_indices(len(dates), max_points)
+        # Scattergl: SVG 대신 WebGL로 그려 점이 많아도 브라우저 렌더링이 가볍습니다.
+        traces.append(go.Scattergl(
+            x=sale_values[keep],
+            y=rent_values[keep],
+            mode='lines+markers',
+            name=region,
+            line=dict(color=color_map.get(region)), # 사용자가 선택한 색상 적용
+            customdata=np.datetime_as_string(dates[keep], unit='D'),
+            hovertemplate="지역=%{fullData.name}<br>날짜=%{customdata}<br>매매지수=%{x}<br>전세지수=%{y}<extra></extra>",
+        ))
+
+        # 경로 마지막(가장 최근 날짜) 점의 위치와 지역명을 모아 둡니다.
+        label_x.append(sale_values[-1])
+        label_y.append(rent_values[-1])
+        label_text.append(f"<b>{region}</b>")
+
+    # 지역명은 지역마다 주석(annotation)을 만들지 않고 하나의 텍스트 트레이스로 표시합니다.
+    traces.append(go.Scatter(
+        x=label_x,
+        y=label_y,
+        text=label_text,
+        mode='text',
+        textposition='top center',
+        textfont=dict(size=12, color="black"),
+        hoverinfo='skip',
+        showlegend=False,
+    ))
+
+    # 지역마다 add_trace를 호출하지 않고 한 번에 설정합니다.
+    fig = go.Figure(data=traces)
+
+    # 그래프 레이아웃 설정
+    fig.update_layout(
+        title=f"부동산 4분면 지수 경로 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})",
+        xaxis_title="매매지수",
+        yaxis_title="전세지수",
+        height=700,
+        legend_title="지역",
+        showlegend=True # 색상을 직접 지정하므로 범례를 다시 표시합니다.
+    )
+
+    return fig
@@ -0,0 +1,100 @@
+import datetime
+
+import pandas as pd
+
+from realestate_core import (
+    MAX_TOTAL_POINTS,
+    MIN_POINTS_PER_REGION,
+    build_long_frame,
+    build_region_groups,
+    clean_index_sheet,
+    downsample_indices,
+    get_max_points_per_region,
+)
+
+# 실제 통합 문서의 지역별 주간 데이터 개수
+N_WEEKS = 880
+
+
+def test_all_points_kept_within_budget():
+    max_points = get_max_points_per_region([N_WEEKS] * 5)
+    indices = downsample_indices(N_WEEKS, max_points)
+    assert len(indices) == N_WEEKS
+
+
+def test_sixth_region_stays_within_budget_and_floor():
+    max_points = get_max_points_per_region([N_WEEKS] * 6)
+    indices = downsample_indices(N_WEEKS, max_points)
+    assert len(indices) == max_points
+    assert MIN_POINTS_PER_REGION <= len(indices)
+    assert 6 * len(indices) <= MAX_TOTAL_POINTS
+    assert indices[0] == 0
+    assert indices[-1] == N_WEEKS - 1
+
+
+def test_floor_applies_when_many_regions():
+    max_points = get_max_points_per_region([N_WEEKS] * 20)
+    assert max_points == MIN_POINTS_PER_REGION
+    assert len(downsample_indices(N_WEEKS, max_points)) == MIN_POINTS_PER_REGION
+
+
+def test_clean_index_sheet_tolerates_stray_text():
+    sheet = pd.DataFrame({
+        '구분': [datetime.datetime(2025, 9, 22), datetime.datetime(2025, 9, 29), '주: 각주', None],
+        '서울특별시': [100.5, '-', 'x', None],
+    })
+    cleaned = clean_index_sheet(sheet)
+    assert list(cleaned.index) == [pd.Timestamp(2025, 9, 22), pd.Timestamp(2025, 9, 29)]
+    assert cleaned.index.name == '날짜'
+    assert cleaned['서울특별시'].dtype == 'float32'
+    assert cleaned['서울특별시'].tolist() == [100.5, 0.0]
+
+
+def make_sheet(dates, columns):
+    """'구분' 열과 지역별 지수 열을 가진 엑셀 시트 형태의 DataFrame을 만드는 함수"""
+    sheet = pd.DataFrame({'구분': [pd.Timestamp(d) for d in dates]})
+    for region, values in columns.items():
+        sheet[region] = values
+    return sheet
+
+
+def test_long_frame_keeps_only_weeks_and_regions_in_both_sheets():
+    sale = clean_index_sheet(make_sheet(
+        ['2025-01-13', '2025-01-20', '2025-01-27'],
+        {'서울': [1.0, 2.0, 3.0], '부산': [4.0, 5.0, 6.0], '대구': [7.0, 8.0, 9.0]},
+    ))
+    # 전세 시트에는 2025-01-20 주와 '대구' 지역이 없습니다.
+    rent = clean_index_sheet(make_sheet(
+        ['2025-01-13', '2025-01-27'],
+        {'서울': [10.0, 30.0], '부산': [40.0, 60.0]},
+    ))
+    df = build_long_frame(sale, rent)
+
+    assert list(df['지역'].cat.categories) == ['서울', '부산']
+    assert pd.Timestamp('2025-01-20') not in set(df['날짜'])
+    assert not (df['전세지수'] == 0).any()
+    assert len(df) == 4
+
+
+def test_region_groups_pair_dates_regions_and_values():
+    # 매매 시트는 날짜가 뒤섞여 있고, 지역 열 순서는 가나다순이 아닙니다.
+    sale = clean_index_sheet(make_sheet(
+        ['2025-01-27', '2025-01-06', '2025-01-20', '2025-01-13'],
+        {'서울': [14.0, 11.0, 13.0, 12.0], '부산': [24.0, 21.0, 23.0, 22.0], '대구': [34.0, 31.0, 33.0, 32.0]},
+    ))
+    rent = clean_index_sheet(make_sheet(
+        ['2025-01-06', '2025-01-13', '2025-01-20', '2025-01-27'],
+        {'서울': [111.0, 112.0, 113.0, 114.0], '부산': [121.0, 122.0, 123.0, 124.0], '대구': [131.0, 132.0, 133.0, 134.0]},
+    ))
+    groups = build_region_groups(build_long_frame(sale, rent))
+
+    assert list(groups) == ['서울', '부산', '대구']
+    assert not any(arr.flags.writeable for arrays in groups.values() for arr in arrays)
+    expected_dates = [pd.Timestamp(d) for d in ['2025-01-06', '2025-01-13', '2025-01-20', '2025-01-27']]
+    for offset, region in ((10, '서울'), (20, '부산'), (30, '대구')):
+        dates, sale_values, rent_values = groups[region]
+        triples = list(zip(pd.to_datetime(dates), sale_values.tolist(), rent_values.tolist()))
+        assert triples == [
+            (date, float(offset + week), float(100 + offset + week))
+            for week, date in enumerate(expected_dates, start=1)
+        ]